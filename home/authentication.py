@@ -0,0 +1,37 @@
+import hashlib
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+TOKEN_CACHE_TIMEOUT = 60
+
+
+def _token_cache_key(key: str) -> str:
+    return "auth_token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def forget_cached_token(key: str) -> None:
+    cache.delete(_token_cache_key(key))
+
+
+class ProfileTokenAuthentication(TokenAuthentication):
+    # Loads the profile alongside the user so role checks don't need a second query,
+    # and keeps the result briefly so bursts of requests skip the lookup entirely.
+
+    def authenticate_credentials(self, key):
+        cache_key = _token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user__userprofile").get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            cache.set(cache_key, token, TOKEN_CACHE_TIMEOUT)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
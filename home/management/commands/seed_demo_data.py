@@ -1,11 +1,12 @@
 import os
-import mimetypes
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from urllib.parse import urlparse
-from urllib.request import Request, urlopen
 
+import urllib3
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.files.base import ContentFile
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
@@ -38,19 +39,44 @@ def _safe_filename_from_url(url: str) -> str:
     return name.split("?")[0].strip() or "image"
 
 
+# Shared pool so downloads from the same host reuse keep-alive connections.
+_HTTP = urllib3.PoolManager(num_pools=10, maxsize=10, headers={"User-Agent": "Mozilla/5.0"})
+
+
 def _download_bytes(url: str, timeout: int = 25) -> tuple[bytes, str]:
-    req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    with urlopen(req, timeout=timeout) as resp:
-        content = resp.read()
-        content_type = resp.headers.get("Content-Type", "").split(";")[0].strip()
-        return content, content_type
+    resp = _HTTP.request("GET", url, timeout=timeout)
+    if resp.status >= 400:
+        raise CommandError(f"Failed to download {url}: HTTP {resp.status}")
+    content_type = resp.headers.get("Content-Type", "").split(";")[0].strip()
+    return resp.data, content_type
+
+
+def _download_all(urls: list[str], max_workers: int = 8) -> list[tuple[bytes, str]]:
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        return list(pool.map(_download_bytes, urls))
+
+
+def _store_once(storage, name: str, content: bytes) -> str:
+    # Reuse the file from a previous seed run instead of writing a suffixed copy.
+    if storage.exists(name) and storage.size(name) == len(content):
+        with storage.open(name, "rb") as existing:
+            if existing.read() == content:
+                return name
+    return storage.save(name, ContentFile(content))
+
+
+IMAGE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
 
 
 def _ext_from_content_type(content_type: str) -> str:
-    if not content_type:
-        return ""
-    ext = mimetypes.guess_extension(content_type)
-    return ext or ""
+    return IMAGE_EXTENSIONS.get(content_type, "")
 
 
 class Command(BaseCommand):
@@ -70,13 +96,11 @@ class Command(BaseCommand):
 
         owners = []
         for od in owners_data:
-            user, created = User.objects.get_or_create(
+            # Callable defaults only run on create, so the password goes in with the INSERT.
+            user, _ = User.objects.get_or_create(
                 username=od["username"],
-                defaults={"email": od["email"]},
+                defaults={"email": od["email"], "password": lambda: make_password("Demo@12345")},
             )
-            if created:
-                user.set_password("Demo@12345")
-                user.save(update_fields=["password"])
             UserProfile.objects.get_or_create(
                 user=user,
                 defaults={"role": UserProfile.ROLE_OWNER, "phone": od["phone"]},
@@ -152,8 +176,7 @@ class Command(BaseCommand):
 
         # Download images once
         downloaded = []
-        for url in IMAGE_URLS:
-            content, content_type = _download_bytes(url)
+        for url, (content, content_type) in zip(IMAGE_URLS, _download_all(IMAGE_URLS)):
             base = _safe_filename_from_url(url)
             ext = os.path.splitext(base)[1]
             if not ext:
@@ -163,6 +186,13 @@ class Command(BaseCommand):
             final_name = f"{os.path.splitext(base)[0]}{ext}"
             downloaded.append((final_name, content))
 
+        # Store each image once; every vehicle row points at the same file.
+        image_field = VehicleImage._meta.get_field("image")
+        stored_paths = [
+            _store_once(image_field.storage, image_field.generate_filename(None, fname), content)
+            for fname, content in downloaded
+        ]
+
         created_vehicles = []
         for idx, vd in enumerate(vehicles_seed):
             loc = DELHI_LOCATIONS[idx % len(DELHI_LOCATIONS)]
@@ -173,22 +203,36 @@ class Command(BaseCommand):
                 "location": loc["location"],
                 "pickup_location": loc["pickup_location"],
             }
-
-            vehicle, _ = Vehicle.objects.update_or_create(
-                owner=vd["owner"],
-                title=vd["title"],
-                defaults=defaults,
-            )
-            created_vehicles.append(vehicle)
-
-        total_images = 0
+            created_vehicles.append(Vehicle(**defaults))
+
+        # Upsert on (owner, title): one lookup, then one batched UPDATE and INSERT.
+        existing = {
+            (vehicle.owner_id, vehicle.title): vehicle
+            for vehicle in Vehicle.objects.filter(
+                owner__in=owners,
+                title__in=[vd["title"] for vd in vehicles_seed],
+            ).only("id", "owner_id", "title")
+        }
+        to_update, to_create = [], []
         for vehicle in created_vehicles:
-            VehicleImage.objects.filter(vehicle=vehicle).delete()
-
-            for img_idx, (fname, content) in enumerate(downloaded):
-                vi = VehicleImage(vehicle=vehicle, is_primary=(img_idx == 0))
-                vi.image.save(fname, ContentFile(content), save=True)
-                total_images += 1
+            current = existing.get((vehicle.owner_id, vehicle.title))
+            if current:
+                vehicle.pk = current.pk
+                to_update.append(vehicle)
+            else:
+                to_create.append(vehicle)
+        update_fields = [name for name in defaults if name not in ("owner", "title")]
+        Vehicle.objects.bulk_update(to_update, update_fields, batch_size=100)
+        Vehicle.objects.bulk_create(to_create, batch_size=100)
+
+        VehicleImage.objects.filter(vehicle__in=created_vehicles).delete()
+        images = [
+            VehicleImage(vehicle=vehicle, image=path, is_primary=(img_idx == 0))
+            for vehicle in created_vehicles
+            for img_idx, path in enumerate(stored_paths)
+        ]
+        VehicleImage.objects.bulk_create(images, batch_size=500)
+        total_images = len(images)
 
         self.stdout.write(self.style.SUCCESS("✅ Demo seed complete"))
         self.stdout.write(self.style.SUCCESS(f"Owners: {len(owners)}"))
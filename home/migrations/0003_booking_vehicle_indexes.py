@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-15 17:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0002_vehicle_city'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['vehicle', 'start_at', 'end_at'], name='home_bookin_vehicle_64899d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status'], name='home_bookin_status_1b7593_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['is_active', 'vehicle_type'], name='home_vehicl_is_acti_7150c7_idx'),
+        ),
+    ]
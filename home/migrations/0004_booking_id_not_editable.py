@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-15 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_booking_vehicle_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='booking_id',
+            field=models.CharField(editable=False, max_length=40, unique=True),
+        ),
+    ]
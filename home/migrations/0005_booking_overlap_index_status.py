@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-15 17:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_booking_id_not_editable'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='home_bookin_vehicle_64899d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['vehicle', 'status', 'start_at', 'end_at'], name='home_bookin_vehicle_e4452d_idx'),
+        ),
+    ]
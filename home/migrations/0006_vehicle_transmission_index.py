@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-15 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0005_booking_overlap_index_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['transmission'], name='home_vehicl_transmi_ea5d7c_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
-import random
-import string
+import base64
+import os
+from datetime import timedelta
 from decimal import Decimal
 
 from django.conf import settings
@@ -61,6 +62,12 @@ class Vehicle(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_active", "vehicle_type"]),
+            models.Index(fields=["transmission"]),
+        ]
+
     def __str__(self) -> str:
         return f"{self.title} - {self.location}"
 
@@ -84,7 +91,7 @@ class Booking(models.Model):
         (UNIT_WEEKLY, "Weekly"),
     ]
 
-    booking_id = models.CharField(max_length=40, unique=True, blank=True)
+    booking_id = models.CharField(max_length=40, unique=True, editable=False)
     customer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="bookings")
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name="bookings")
     start_at = models.DateTimeField()
@@ -97,13 +104,19 @@ class Booking(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["vehicle", "status", "start_at", "end_at"]),
+            models.Index(fields=["status"]),
+        ]
+
     def clean(self) -> None:
         if self.start_at >= self.end_at:
             raise ValidationError("Start time must be before end time.")
 
     def duration_hours(self) -> Decimal:
-        delta = self.end_at - self.start_at
-        return Decimal(delta.total_seconds()) / Decimal(3600)
+        micros = (self.end_at - self.start_at) // timedelta(microseconds=1)
+        return Decimal(micros) / Decimal(3_600_000_000)
 
     def calculate_total(self) -> Decimal:
         hours = self.duration_hours()
@@ -118,18 +131,36 @@ class Booking(models.Model):
         base = (weeks * self.vehicle.weekly_rate).quantize(Decimal("0.01"))
         return (base + self.delivery_fee).quantize(Decimal("0.01"))
 
-    def save(self, *args, **kwargs) -> None:
+    def _prepare_for_write(self, validate: bool = True, update_fields=None) -> None:
         if timezone.is_naive(self.start_at) or timezone.is_naive(self.end_at):
             raise ValidationError("start_at and end_at must be timezone-aware.")
         if not self.booking_id:
             timestamp = timezone.now()
             date_part = timestamp.strftime("%Y%m%d%H%M%S")
-            rand = "".join(random.choices(string.ascii_uppercase + string.digits, k=5))
+            rand = base64.b32encode(os.urandom(4)).decode()[:5]
             self.booking_id = f"BK{date_part}{rand}"
-        self.full_clean()
-        self.total_price = self.calculate_total()
+        if validate:
+            exclude = None
+            if update_fields is not None:
+                exclude = [field.name for field in self._meta.fields if field.name not in update_fields]
+            self.full_clean(exclude=exclude)
+        # Partial writes such as status changes leave the stored price alone.
+        if update_fields is None or "total_price" in update_fields:
+            self.total_price = self.calculate_total()
+
+    def save(self, *args, skip_validation: bool = False, **kwargs) -> None:
+        self._prepare_for_write(validate=not skip_validation, update_fields=kwargs.get("update_fields"))
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_create_validated(cls, bookings, batch_size: int = 500) -> list["Booking"]:
+        # Skips full_clean(); only the checks save() can't get from the database are kept.
+        bookings = list(bookings)
+        for booking in bookings:
+            booking._prepare_for_write(validate=False)
+            booking.clean()
+        return cls.objects.bulk_create(bookings, batch_size=batch_size)
+
 
 class VehicleImage(models.Model):
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name="images")
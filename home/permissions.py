@@ -3,13 +3,22 @@ from rest_framework import permissions
 from .models import UserProfile
 
 
-def _has_role(user, role: str) -> bool:
-    if not user or not user.is_authenticated:
-        return False
+def _get_role(user):
+    # Cached on the user instance, which only lives for the current request.
+    if hasattr(user, "_cached_role"):
+        return user._cached_role
     try:
-        return user.userprofile.role == role
+        role = user.userprofile.role
     except UserProfile.DoesNotExist:
+        role = None
+    user._cached_role = role
+    return role
+
+
+def _has_role(user, role: str) -> bool:
+    if not user or not user.is_authenticated:
         return False
+    return _get_role(user) == role
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
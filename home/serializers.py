@@ -1,5 +1,5 @@
 from django.contrib.auth import authenticate, get_user_model
-from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
 
@@ -21,7 +21,7 @@ class RegisterSerializer(serializers.Serializer):
         password = validated_data.pop("password")
         user = User.objects.create_user(password=password, **validated_data)
         UserProfile.objects.create(user=user, role=role, phone=phone)
-        token, _ = Token.objects.get_or_create(user=user)
+        token = Token.objects.create(user=user)
         return user, token
 
 
@@ -43,11 +43,29 @@ class UserProfileSerializer(serializers.ModelSerializer):
         fields = ["role", "phone"]
 
 
+class VehicleImageUrlField(serializers.RelatedField):
+    @cached_property
+    def base_url(self) -> str:
+        # Fields are bound per serializer instance, so this is resolved once per response.
+        request = self.context.get("request")
+        if not request:
+            return ""
+        return request.build_absolute_uri("/")[:-1]
+
+    def to_representation(self, value):
+        url = value.image.url
+        if not url.startswith("/"):
+            return url
+        return self.base_url + url
+
+
 class VehicleSerializer(serializers.ModelSerializer):
     owner = serializers.ReadOnlyField(source="owner.username")
-    avg_rating = serializers.SerializerMethodField()
+    # Annotated by VehicleViewSet.get_queryset; the defaults cover freshly created vehicles.
+    avg_rating = serializers.FloatField(read_only=True, default=None)
+    review_count = serializers.IntegerField(read_only=True, default=0)
     is_booked = serializers.SerializerMethodField()
-    images = serializers.SerializerMethodField()
+    images = VehicleImageUrlField(many=True, read_only=True)
 
     class Meta:
         model = Vehicle
@@ -70,38 +88,15 @@ class VehicleSerializer(serializers.ModelSerializer):
             "delivery_fee",
             "is_active",
             "avg_rating",
+            "review_count",
             "is_booked",
             "images",
             "created_at",
         ]
 
-    def get_avg_rating(self, obj):
-        reviews = obj.reviews.all()
-        if not reviews:
-            return None
-        total = sum(review.rating for review in reviews)
-        return round(total / reviews.count(), 2)
-
     def get_is_booked(self, obj):
-        request = self.context.get("request")
-        if not request:
-            return False
-        start_at = request.query_params.get("start_at")
-        end_at = request.query_params.get("end_at")
-        if not (start_at and end_at):
-            return False
-        parsed_start = parse_datetime(start_at)
-        parsed_end = parse_datetime(end_at)
-        if not (parsed_start and parsed_end):
-            return False
-        return obj.bookings.filter(
-            start_at__lt=parsed_end,
-            end_at__gt=parsed_start,
-            status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED],
-        ).exists()
-
-    def get_images(self, obj):
-        return [f"http://127.0.0.1:8000{image.image.url}" for image in obj.images.all()]
+        # Annotated by VehicleViewSet.get_queryset when start_at/end_at are given.
+        return getattr(obj, "is_booked", False)
 
 
 class VehicleImageSerializer(serializers.ModelSerializer):
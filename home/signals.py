@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import forget_cached_token
+from .models import UserProfile
+
+
+def _forget_user_tokens(user_id) -> None:
+    for key in Token.objects.filter(user_id=user_id).values_list("key", flat=True):
+        forget_cached_token(key)
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    forget_cached_token(instance.key)
+
+
+# Cached tokens carry the user and profile, so any change to either drops them.
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def forget_user_tokens(sender, instance, created, **kwargs):
+    if not created:
+        _forget_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def forget_profile_tokens(sender, instance, **kwargs):
+    _forget_user_tokens(instance.user_id)
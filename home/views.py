@@ -1,10 +1,17 @@
-from django.db import models
-from django.db.models import Avg, Max, Min
+import uuid
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Avg, Count, Exists, Max, Min, OuterRef, Prefetch
+from django.db.models.functions import Round
+from django.http import StreamingHttpResponse
 from django.utils.dateparse import parse_datetime
 from rest_framework import permissions, status, viewsets
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -22,6 +29,25 @@ from .serializers import (
 )
 
 
+def _set_booking_status(queryset, pk, new_status) -> bool:
+    # Single-column UPDATE without loading the row; False when nothing matched.
+    try:
+        return queryset.filter(pk=pk).update(status=new_status) > 0
+    except (TypeError, ValueError, ValidationError):
+        return False
+
+
+# Filter panels resend the same query strings, so parse each raw value once.
+@lru_cache(maxsize=2048)
+def _parse_csv(raw):
+    return tuple(value.strip() for value in raw.split(",") if value.strip())
+
+
+@lru_cache(maxsize=2048)
+def _parse_datetime(raw):
+    return parse_datetime(raw)
+
+
 class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -50,50 +76,74 @@ class LoginView(APIView):
 
 
 class VehicleViewSet(viewsets.ModelViewSet):
-    queryset = Vehicle.objects.all().order_by("-created_at")
+    queryset = Vehicle.objects.select_related("owner").order_by("-created_at")
     serializer_class = VehicleSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
 
+    # query param -> ORM lookup
+    FILTER_MAP = {
+        "location": "location__icontains",
+        "pickup_location": "pickup_location__icontains",
+        "seats": "seats",
+        "seats_min": "seats__gte",
+        "seats_max": "seats__lte",
+        "price_min": "hourly_rate__gte",
+        "price_max": "hourly_rate__lte",
+    }
+    # comma-separated query param -> ORM __in lookup
+    CSV_FILTER_MAP = {
+        "transmission": "transmission__in",
+        "vehicle_type": "vehicle_type__in",
+    }
+
     def get_queryset(self):
-        queryset = super().get_queryset().filter(is_active=True)
+        queryset = (
+            super()
+            .get_queryset()
+            .filter(is_active=True)
+            .annotate(avg_rating=Round(Avg("reviews__rating"), 2), review_count=Count("reviews"))
+            # Columns rendered by VehicleSerializer; anything else stays in the database.
+            .only(
+                "id",
+                "owner",
+                "owner__username",
+                "title",
+                "description",
+                "location",
+                "pickup_location",
+                "vehicle_type",
+                "make",
+                "model",
+                "year",
+                "seats",
+                "transmission",
+                "hourly_rate",
+                "daily_rate",
+                "weekly_rate",
+                "delivery_fee",
+                "is_active",
+                "created_at",
+            )
+        )
+        if self.action not in ("quote", "availability"):
+            # Only actions that render VehicleSerializer need the images.
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "images",
+                    queryset=VehicleImage.objects.only("id", "vehicle", "image", "is_primary").order_by("-is_primary", "id"),
+                )
+            )
+
         params = self.request.query_params
-        location = params.get("location")
-        seats_min = params.get("seats_min")
-        seats_max = params.get("seats_max")
-        seats = params.get("seats")
-        transmission = params.get("transmission")
-        vehicle_type = params.get("vehicle_type")
-        pickup_location = params.get("pickup_location")
-        price_min = params.get("price_min")
-        price_max = params.get("price_max")
+        lookups = {lookup: value for param, lookup in self.FILTER_MAP.items() if (value := params.get(param))}
+        for param, lookup in self.CSV_FILTER_MAP.items():
+            values = _parse_csv(params.get(param, ""))
+            if values:
+                lookups[lookup] = values
+        if lookups:
+            queryset = queryset.filter(**lookups)
+
         search = params.get("search")
-        sort = params.get("sort")
-        start_at = params.get("start_at")
-        end_at = params.get("end_at")
-        available_only = params.get("available_only")
-
-        if location:
-            queryset = queryset.filter(location__icontains=location)
-        if transmission:
-            transmission_values = [value.strip() for value in transmission.split(",") if value.strip()]
-            if transmission_values:
-                queryset = queryset.filter(transmission__in=transmission_values)
-        if vehicle_type:
-            type_values = [value.strip() for value in vehicle_type.split(",") if value.strip()]
-            if type_values:
-                queryset = queryset.filter(vehicle_type__in=type_values)
-        if pickup_location:
-            queryset = queryset.filter(pickup_location__icontains=pickup_location)
-        if seats:
-            queryset = queryset.filter(seats=seats)
-        if seats_min:
-            queryset = queryset.filter(seats__gte=seats_min)
-        if seats_max:
-            queryset = queryset.filter(seats__lte=seats_max)
-        if price_min:
-            queryset = queryset.filter(hourly_rate__gte=price_min)
-        if price_max:
-            queryset = queryset.filter(hourly_rate__lte=price_max)
         if search:
             queryset = queryset.filter(
                 models.Q(title__icontains=search)
@@ -101,17 +151,22 @@ class VehicleViewSet(viewsets.ModelViewSet):
                 | models.Q(model__icontains=search)
             )
 
-        if start_at and end_at and available_only in {"1", "true", "yes"}:
-            parsed_start = parse_datetime(start_at)
-            parsed_end = parse_datetime(end_at)
-            if parsed_start and parsed_end:
-                conflict_ids = Booking.objects.filter(
-                    start_at__lt=parsed_end,
-                    end_at__gt=parsed_start,
-                    status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED],
-                ).values_list("vehicle_id", flat=True)
-                queryset = queryset.exclude(id__in=conflict_ids)
+        start_at = params.get("start_at")
+        end_at = params.get("end_at")
+        parsed_start = _parse_datetime(start_at) if start_at else None
+        parsed_end = _parse_datetime(end_at) if end_at else None
+        if parsed_start and parsed_end:
+            overlapping = Booking.objects.filter(
+                vehicle=OuterRef("pk"),
+                start_at__lt=parsed_end,
+                end_at__gt=parsed_start,
+                status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED],
+            )
+            queryset = queryset.annotate(is_booked=Exists(overlapping))
+            if params.get("available_only") in {"1", "true", "yes"}:
+                queryset = queryset.filter(is_booked=False)
 
+        sort = params.get("sort")
         if sort == "price":
             queryset = queryset.order_by("hourly_rate")
         elif sort == "-price":
@@ -119,13 +174,60 @@ class VehicleViewSet(viewsets.ModelViewSet):
         elif sort == "newest":
             queryset = queryset.order_by("-created_at")
         elif sort == "rating":
-            queryset = queryset.annotate(avg_rating=Avg("reviews__rating")).order_by("-avg_rating")
+            queryset = queryset.order_by("-avg_rating")
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        # The list is unpaginated, so stream it in chunks instead of building
+        # every vehicle in memory first. Browsable API keeps the normal path.
+        renderer = request.accepted_renderer
+        if self.paginator is not None or renderer.format != "json":
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        media_type = request.accepted_media_type
+        renderer_context = self.get_renderer_context()
+
+        # Lay items out the way rendering the whole list would, including
+        # `Accept: application/json; indent=N`.
+        indent = renderer.get_indent(media_type, renderer_context)
+        if indent is None:
+            pad = b""
+            separator = b"," if renderer.compact else b", "
+        else:
+            pad = b"\n" + b" " * indent
+            separator = b"," + pad
+
+        def render(vehicle):
+            content = renderer.render(serializer.to_representation(vehicle), media_type, renderer_context)
+            return content.replace(b"\n", pad) if pad else content
+
+        # Prefetches run per chunk, so memory stays bounded. The first chunk is
+        # fetched here so database errors still get a normal error response.
+        vehicles = queryset.iterator(chunk_size=500)
+        first = next(vehicles, None)
+        if first is None:
+            return Response([])
+        head = b"[" + pad + render(first)
+
+        def stream():
+            yield head
+            for vehicle in vehicles:
+                yield separator + render(vehicle)
+            yield pad[:1] + b"]"
+
+        return StreamingHttpResponse(stream(), content_type=renderer.media_type)
+
+    def get_permissions(self):
+        perms = super().get_permissions()
+        if self.action == "create":
+            is_owner = IsOwner()
+            is_owner.message = "Only owners can add vehicles."
+            perms.append(is_owner)
+        return perms
+
     def perform_create(self, serializer):
-        if not IsOwner().has_permission(self.request, self):
-            raise PermissionDenied("Only owners can add vehicles.")
         serializer.save(owner=self.request.user)
 
     @action(detail=True, methods=["get"])
@@ -139,8 +241,8 @@ class VehicleViewSet(viewsets.ModelViewSet):
                 {"detail": "start_at, end_at, and pricing_unit are required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        parsed_start = parse_datetime(start_at)
-        parsed_end = parse_datetime(end_at)
+        parsed_start = _parse_datetime(start_at)
+        parsed_end = _parse_datetime(end_at)
         if not (parsed_start and parsed_end):
             return Response({"detail": "Invalid datetime format."}, status=status.HTTP_400_BAD_REQUEST)
         booking = Booking(
@@ -165,19 +267,19 @@ class VehicleViewSet(viewsets.ModelViewSet):
                 {"detail": "start_at and end_at are required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        parsed_start = parse_datetime(start_at)
-        parsed_end = parse_datetime(end_at)
+        parsed_start = _parse_datetime(start_at)
+        parsed_end = _parse_datetime(end_at)
         if not (parsed_start and parsed_end):
             return Response({"detail": "Invalid datetime format."}, status=status.HTTP_400_BAD_REQUEST)
-        bookings = vehicle.bookings.filter(
-            start_at__lt=parsed_end,
-            end_at__gt=parsed_start,
-            status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED],
-        ).order_by("start_at")
-        data = [
-            {"start_at": b.start_at, "end_at": b.end_at, "status": b.status}
-            for b in bookings
-        ]
+        data = list(
+            vehicle.bookings.filter(
+                start_at__lt=parsed_end,
+                end_at__gt=parsed_start,
+                status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED],
+            )
+            .order_by("start_at")
+            .values("start_at", "end_at", "status")
+        )
         return Response({"vehicle_id": vehicle.id, "booked_slots": data})
 
 
@@ -226,7 +328,11 @@ class BookingViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsCustomer]
 
     def get_queryset(self):
-        return Booking.objects.filter(customer=self.request.user).order_by("-created_at")
+        return (
+            Booking.objects.filter(customer=self.request.user)
+            .select_related("customer", "vehicle")
+            .order_by("-created_at")
+        )
 
     def perform_create(self, serializer):
         vehicle = serializer.validated_data["vehicle"]
@@ -236,19 +342,22 @@ class BookingViewSet(viewsets.ModelViewSet):
         delivery_fee = serializer.validated_data.get("delivery_fee")
         if delivery_fee is None:
             delivery_fee = vehicle.delivery_fee
-        overlap = Booking.objects.filter(
-            vehicle=vehicle,
-            start_at__lt=end_at,
-            end_at__gt=start_at,
-            status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED],
-        ).exists()
-        if overlap:
-            raise PermissionDenied("Vehicle is not available in the selected time window.")
-        serializer.save(
-            customer=self.request.user,
-            pickup_location=pickup_location,
-            delivery_fee=delivery_fee,
-        )
+        with transaction.atomic():
+            # Lock the vehicle row so concurrent requests can't both pass the overlap check.
+            Vehicle.objects.select_for_update().only("id").get(pk=vehicle.pk)
+            overlap = Booking.objects.filter(
+                vehicle=vehicle,
+                start_at__lt=end_at,
+                end_at__gt=start_at,
+                status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED],
+            ).exists()
+            if overlap:
+                raise PermissionDenied("Vehicle is not available in the selected time window.")
+            serializer.save(
+                customer=self.request.user,
+                pickup_location=pickup_location,
+                delivery_fee=delivery_fee,
+            )
 
     @action(detail=True, methods=["post"])
     def checkout(self, request, pk=None):
@@ -259,28 +368,27 @@ class BookingViewSet(viewsets.ModelViewSet):
             booking=booking,
             amount=booking.total_price,
             status=Payment.STATUS_PENDING,
+            reference_id=uuid.uuid4().hex,
         )
-        payment.reference_id = str(payment.id)
-        payment.save()
         data = PaymentSerializer(payment).data
         data["message"] = "Integrate Cashfree payment here."
         return Response(data)
 
     @action(detail=True, methods=["post"])
     def cancel(self, request, pk=None):
-        booking = self.get_object()
-        if booking.status == Booking.STATUS_CANCELLED:
-            return Response({"detail": "Booking already cancelled."}, status=status.HTTP_400_BAD_REQUEST)
-        booking.status = Booking.STATUS_CANCELLED
-        booking.save()
-        return Response({"detail": "Booking cancelled."})
+        active = self.get_queryset().exclude(status=Booking.STATUS_CANCELLED)
+        if _set_booking_status(active, pk, Booking.STATUS_CANCELLED):
+            return Response({"detail": "Booking cancelled."})
+        self.get_object()
+        return Response({"detail": "Booking already cancelled."}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=["get"])
     def previous(self, request):
-        queryset = Booking.objects.filter(
-            customer=request.user,
-            status__in=[Booking.STATUS_CONFIRMED, Booking.STATUS_CANCELLED],
-        ).order_by("-created_at")
+        queryset = self.get_queryset().filter(status__in=[Booking.STATUS_CONFIRMED, Booking.STATUS_CANCELLED])
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -290,41 +398,53 @@ class OwnerBookingViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsOwner]
 
     def get_queryset(self):
-        return Booking.objects.filter(vehicle__owner=self.request.user).order_by("-created_at")
+        return (
+            Booking.objects.filter(vehicle__owner=self.request.user)
+            .select_related("customer", "vehicle")
+            .order_by("-created_at")
+        )
 
     @action(detail=True, methods=["post"])
     def approve(self, request, pk=None):
-        booking = self.get_object()
-        booking.status = Booking.STATUS_CONFIRMED
-        booking.save()
+        if not _set_booking_status(self.get_queryset(), pk, Booking.STATUS_CONFIRMED):
+            raise NotFound("No Booking matches the given query.")
         return Response({"detail": "Booking confirmed."})
 
     @action(detail=True, methods=["post"])
     def reject(self, request, pk=None):
-        booking = self.get_object()
-        booking.status = Booking.STATUS_CANCELLED
-        booking.save()
+        if not _set_booking_status(self.get_queryset(), pk, Booking.STATUS_CANCELLED):
+            raise NotFound("No Booking matches the given query.")
         return Response({"detail": "Booking rejected."})
 
 
 class FilterOptionsView(APIView):
     permission_classes = [permissions.AllowAny]
+    cache_key = "filter_options"
+    cache_timeout = 60
 
     def get(self, request):
-        price_stats = Vehicle.objects.aggregate(min_price=Min("hourly_rate"), max_price=Max("hourly_rate"))
-        seats_stats = Vehicle.objects.aggregate(min_seats=Min("seats"), max_seats=Max("seats"))
-        return Response(
-            {
-                "vehicle_types": [choice[0] for choice in Vehicle.TYPE_CHOICES],
-                "transmissions": list(
-                    Vehicle.objects.exclude(transmission="").values_list("transmission", flat=True).distinct()
-                ),
-                "min_hourly_rate": price_stats.get("min_price"),
-                "max_hourly_rate": price_stats.get("max_price"),
-                "min_seats": seats_stats.get("min_seats"),
-                "max_seats": seats_stats.get("max_seats"),
-            }
+        return Response(cache.get_or_set(self.cache_key, self.build_options, self.cache_timeout))
+
+    def build_options(self):
+        stats = Vehicle.objects.aggregate(
+            min_price=Min("hourly_rate"),
+            max_price=Max("hourly_rate"),
+            min_seats=Min("seats"),
+            max_seats=Max("seats"),
         )
+        return {
+            "vehicle_types": [choice[0] for choice in Vehicle.TYPE_CHOICES],
+            "transmissions": list(
+                Vehicle.objects.exclude(transmission="")
+                .order_by("transmission")
+                .values_list("transmission", flat=True)
+                .distinct()
+            ),
+            "min_hourly_rate": stats.get("min_price"),
+            "max_hourly_rate": stats.get("max_price"),
+            "min_seats": stats.get("min_seats"),
+            "max_seats": stats.get("max_seats"),
+        }
 
 
 class PaymentWebhookView(APIView):
@@ -351,13 +471,15 @@ class PaymentWebhookView(APIView):
                 booking=booking,
                 amount=booking.total_price,
                 reference_id=reference_id or "",
+                status=status_value or Payment.STATUS_PENDING,
+                payload=request.data,
             )
-        payment.status = status_value or payment.status
-        payment.payload = request.data
-        payment.save()
+        else:
+            payment.status = status_value or payment.status
+            payment.payload = request.data
+            payment.save(update_fields=["status", "payload"])
         if payment.status == Payment.STATUS_SUCCESS:
-            payment.booking.status = Booking.STATUS_CONFIRMED
-            payment.booking.save()
+            Booking.objects.filter(pk=payment.booking_id).update(status=Booking.STATUS_CONFIRMED)
         return Response({"detail": "Webhook processed."})
 
 
@@ -387,9 +509,9 @@ class UserProfileView(APIView):
         data = request.data
         
         # Update User model fields
-        if 'email' in data:
+        if 'email' in data and data['email'] != user.email:
             user.email = data['email']
-            user.save()
+            user.save(update_fields=['email'])
         
         # Update or create UserProfile
         try:
@@ -397,9 +519,9 @@ class UserProfileView(APIView):
         except UserProfile.DoesNotExist:
             profile = UserProfile.objects.create(user=user)
         
-        if 'phone' in data:
+        if 'phone' in data and data['phone'] != profile.phone:
             profile.phone = data['phone']
-            profile.save()
+            profile.save(update_fields=['phone'])
         
         return Response({
             'username': user.username,
@@ -414,11 +536,15 @@ class AdminStatsView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
+        roles = UserProfile.objects.aggregate(
+            owners=Count("id", filter=models.Q(role=UserProfile.ROLE_OWNER)),
+            customers=Count("id", filter=models.Q(role=UserProfile.ROLE_CUSTOMER)),
+        )
         return Response(
             {
                 "vehicles": Vehicle.objects.count(),
                 "bookings": Booking.objects.count(),
-                "active_owners": UserProfile.objects.filter(role=UserProfile.ROLE_OWNER).count(),
-                "active_customers": UserProfile.objects.filter(role=UserProfile.ROLE_CUSTOMER).count(),
+                "active_owners": roles["owners"],
+                "active_customers": roles["customers"],
             }
         )